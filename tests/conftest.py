@@ -224,7 +224,7 @@ def change_net_config_space_bin(test_fc_session_root_path):
     yield change_net_config_space_bin
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bin_seccomp_paths():
     """Build jailers and jailed binaries to test seccomp.
 
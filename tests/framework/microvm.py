@@ -466,14 +466,19 @@ class Microvm:
             return None
         return tuple(int(x) for x in splits[1].split("."))
 
-    def get_metrics(self):
-        """Return iterator to metric data points written by FC"""
+    def _get_metrics_lines(self):
+        """Return iterator to the complete metric lines written by FC"""
         with self.metrics_file.open() as fd:
             for line in fd:
                 if not line.endswith("}\n"):
                     LOG.warning("Line is not a proper JSON object. Partial write?")
                     continue
-                yield json.loads(line)
+                yield line
+
+    def get_metrics(self):
+        """Return iterator to metric data points written by FC"""
+        for line in self._get_metrics_lines():
+            yield json.loads(line)
 
     def get_all_metrics(self):
         """Return all metric data points written by FC."""
@@ -482,8 +487,13 @@ class Microvm:
     def flush_metrics(self):
         """Flush the microvm metrics and get the latest datapoint"""
         self.api.actions.put(action_type="FlushMetrics")
-        # get the latest metrics
-        return self.get_all_metrics()[-1]
+        # get the latest metrics. Only the last complete line needs to be
+        # parsed, the metrics file grows with every flush.
+        last_line = None
+        for last_line in self._get_metrics_lines():
+            pass
+        assert last_line is not None, "No metrics were written by Firecracker"
+        return json.loads(last_line)
 
     def create_jailed_resource(self, path):
         """Create a hard link to some resource inside this microvm."""
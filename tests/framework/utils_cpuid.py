@@ -6,6 +6,7 @@ import platform
 import re
 import subprocess
 from enum import Enum, auto
+from functools import lru_cache
 
 from framework.utils import check_output
 from framework.utils_imdsv2 import imdsv2_get
@@ -45,6 +46,7 @@ CPU_DICT = {
 }
 
 
+@lru_cache
 def get_cpu_vendor():
     """Return the CPU vendor."""
     brand_str = subprocess.check_output("lscpu", shell=True).strip().decode()
@@ -56,6 +58,7 @@ def get_cpu_vendor():
     return CpuVendor.INTEL
 
 
+@lru_cache
 def get_cpu_model_name():
     """Return the CPU model name."""
     if platform.machine() == "aarch64":
@@ -99,7 +102,16 @@ def check_guest_cpuid_output(
     _, stdout, stderr = vm.ssh.run(guest_cmd)
 
     assert stderr == ""
-    for line in stdout.split("\n"):
+    check_cpuid_output(
+        stdout, expected_header, expected_separator, expected_key_value_store
+    )
+
+
+def check_cpuid_output(
+    output, expected_header, expected_separator, expected_key_value_store
+):
+    """Parse already collected cpuid output and match with expected one."""
+    for line in output.split("\n"):
         if line != "":
             # All the keys have been matched. Stop.
             if not expected_key_value_store:
@@ -158,14 +158,6 @@ def check_guest_connections(vm, server_port_path, blob_path, blob_hash):
         # Firecracker can connect to it.
         vm.create_jailed_resource(server_port_path)
 
-        # Increase maximum process count for the ssh service.
-        # Avoids: "bash: fork: retry: Resource temporarily unavailable"
-        # Needed to execute the bash script that tests for concurrent
-        # vsock guest initiated connections.
-        vm.ssh.check_output(
-            "echo 1024 > /sys/fs/cgroup/system.slice/ssh.service/pids.max"
-        )
-
         # Build the guest worker sub-command.
         # `vsock_helper` will read the blob file from STDIN and send the echo
         # server response to STDOUT. This response is then hashed, and the
@@ -178,11 +170,18 @@ def check_guest_connections(vm, server_port_path, blob_path, blob_hash):
         worker_cmd += ")"
         worker_cmd += ' && [[ "$hash" = "{}" ]]'.format(blob_hash)
 
+        # Increase maximum process count for the ssh service.
+        # Avoids: "bash: fork: retry: Resource temporarily unavailable"
+        # Needed to execute the bash script that tests for concurrent
+        # vsock guest initiated connections. Done as part of the same SSH
+        # command as the workers, to save a round trip.
+        cmd = "echo 1024 > /sys/fs/cgroup/system.slice/ssh.service/pids.max || exit 1; "
+
         # Run `TEST_CONNECTION_COUNT` concurrent workers, using the above
         # worker sub-command.
         # If any worker fails, this command will fail. If all worker sub-commands
         # succeed, this will also succeed.
-        cmd = 'workers="";'
+        cmd += 'workers="";'
         cmd += "for i in $(seq 1 {}); do".format(TEST_CONNECTION_COUNT)
         cmd += "  ({})& ".format(worker_cmd)
         cmd += '  workers="$workers $!";'
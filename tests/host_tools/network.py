@@ -181,15 +181,33 @@ class SSHConnection:
         Execute the command passed as a string in the ssh context.
 
         If `debug` is set, pass `-vvv` to `ssh`. Note that this will clobber stderr.
-        """
-        self._check_liveness()
 
+        The ControlMaster liveness is only checked if the command fails with
+        ssh's own error code (255), to avoid spawning an extra `ssh -O check`
+        process for every command.
+        """
         command = ["ssh", *self.options, self.user_host, cmd_string]
 
         if debug:
             command.insert(1, "-vvv")
 
-        return self._exec(command, timeout, check=check)
+        result = self._exec(command, timeout)
+
+        if result.returncode == 255:
+            self._check_liveness()
+
+        if check and result.returncode != 0:
+            exc = ChildProcessError(
+                f"\nCommand:\n{command}"
+                f"\nstdout:\n{result.stdout}"
+                f"\nstderr:\n{result.stderr}"
+                f"\nReturned error code: {result.returncode}"
+            )
+            if self._on_error:
+                self._on_error(exc)
+            raise exc
+
+        return result
 
     def check_output(self, cmd_string, timeout=100, *, debug=False):
         """Same as `run`, but raises an exception on non-zero return code of remote command"""
@@ -5,7 +5,6 @@
 # Disable pylint C0302: Too many lines in module
 # pylint: disable=C0302
 import os
-import platform
 import re
 import resource
 import time
@@ -17,6 +16,7 @@ import pytest
 import host_tools.drive as drive_tools
 import host_tools.network as net_tools
 from framework import utils_cpuid
+from framework.properties import global_props
 from framework.utils import get_firecracker_version_from_toml, is_io_uring_supported
 
 MEM_LIMIT = 1000000000
@@ -156,11 +156,11 @@ def test_api_put_update_pre_boot(uvm_plain, io_engine):
     # The machine configuration has a default value, so all PUTs are updates.
     microvm_config_json = {
         "vcpu_count": 4,
-        "smt": platform.machine() == "x86_64",
+        "smt": global_props.cpu_architecture == "x86_64",
         "mem_size_mib": 256,
         "track_dirty_pages": True,
     }
-    if platform.machine() == "x86_64":
+    if global_props.cpu_architecture == "x86_64":
         microvm_config_json["cpu_template"] = "C3"
 
     test_microvm.api.machine_config.put(**microvm_config_json)
@@ -176,7 +176,7 @@ def test_api_put_update_pre_boot(uvm_plain, io_engine):
     mem_size_mib = microvm_config_json["mem_size_mib"]
     assert response_json["mem_size_mib"] == mem_size_mib
 
-    if platform.machine() == "x86_64":
+    if global_props.cpu_architecture == "x86_64":
         cpu_template = str(microvm_config_json["cpu_template"])
         assert response_json["cpu_template"] == cpu_template
 
@@ -352,9 +352,9 @@ def test_api_machine_config(uvm_plain):
     assert response.json()["smt"] is False
 
     # Test that smt=True errors on ARM.
-    if platform.machine() == "x86_64":
+    if global_props.cpu_architecture == "x86_64":
         test_microvm.api.machine_config.patch(smt=True)
-    elif platform.machine() == "aarch64":
+    elif global_props.cpu_architecture == "aarch64":
         expected_msg = (
             "Enabling simultaneous multithreading is not supported on aarch64"
         )
@@ -407,7 +407,7 @@ def test_api_machine_config(uvm_plain):
     test_microvm.api.machine_config.patch(mem_size_mib=256)
 
     # Set the cpu template
-    if platform.machine() == "x86_64":
+    if global_props.cpu_architecture == "x86_64":
         test_microvm.api.machine_config.patch(cpu_template="C3")
     else:
         # We test with "None" because this is the only option supported on
@@ -769,7 +769,7 @@ def test_drive_patch(uvm_plain):
 
 
 @pytest.mark.skipif(
-    platform.machine() != "x86_64", reason="not yet implemented on aarch64"
+    global_props.cpu_architecture != "x86_64", reason="not yet implemented on aarch64"
 )
 def test_send_ctrl_alt_del(uvm_plain):
     """
@@ -4,7 +4,6 @@
 
 import json
 import os
-import platform
 import re
 import shutil
 from pathlib import Path
@@ -13,6 +12,7 @@ import pytest
 from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_fixed
 
 from framework import utils, utils_cpuid
+from framework.properties import global_props
 from framework.utils import generate_mmds_get_request, generate_mmds_session_token
 
 # Directory with metadata JSON files
@@ -219,7 +219,7 @@ def test_config_machine_config_params(uvm_plain, test_config):
     check_for_failed_start = (
         (cpu_vendor == utils_cpuid.CpuVendor.AMD and fail_amd)
         or (cpu_vendor == utils_cpuid.CpuVendor.INTEL and fail_intel)
-        or (platform.machine() == "aarch64" and fail_aarch64)
+        or (global_props.cpu_architecture == "aarch64" and fail_aarch64)
     )
 
     if check_for_failed_start:
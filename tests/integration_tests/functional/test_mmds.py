@@ -3,11 +3,12 @@
 """Tests that verify MMDS related functionality."""
 
 # pylint: disable=too-many-lines
+import json
 import random
 import string
-import time
 
 import pytest
+from tenacity import Retrying, stop_after_delay, wait_fixed
 
 from framework.artifacts import working_version_as_artifact
 from framework.utils import (
@@ -26,6 +27,50 @@ MAX_TOKEN_TTL_SECONDS = 21600
 DEFAULT_IPV4 = "169.254.169.254"
 # MMDS versions supported.
 MMDS_VERSIONS = ["V2", "V1"]
+# Meta-data entries common to most of the data stores used below.
+BASE_META_DATA = {
+    "ami-id": "ami-12345678",
+    "reservation-id": "r-fea54097",
+    "local-hostname": "ip-10-251-50-12.ec2.internal",
+    "public-hostname": "ec2-203-0-113-25.compute-1.amazonaws.com",
+}
+
+
+def _configure_and_start(test_microvm, version, data_store, ipv4_address=DEFAULT_IPV4):
+    """Set up MMDS on `eth0`, boot the microVM and route MMDS traffic.
+
+    Returns the SSH connection to the booted guest.
+    """
+    configure_mmds(
+        test_microvm, iface_ids=["eth0"], version=version, ipv4_address=ipv4_address
+    )
+    populate_data_store(test_microvm, data_store)
+
+    test_microvm.basic_config(vcpu_count=1)
+    test_microvm.start()
+    ssh_connection = test_microvm.ssh
+
+    run_guest_cmd(ssh_connection, f"ip route add {ipv4_address} dev eth0", "")
+
+    return ssh_connection
+
+
+def _run_guest_cmds(ssh_connection, pre, checks, use_json=False):
+    """Fetch several MMDS paths over a single SSH exec and check each output.
+
+    `pre` is the request built by `generate_mmds_get_request` and `checks` is
+    a list of `(path, expected)` pairs. The outputs are separated by a NUL
+    byte, which never shows up in MMDS responses.
+    """
+    cmd = " && printf '\\0' && ".join(pre + path for path, _ in checks)
+    _, stdout, stderr = ssh_connection.check_output(cmd)
+    assert stderr == ""
+
+    outputs = stdout.split("\0")
+    assert len(outputs) == len(checks)
+    for output, (_, expected) in zip(outputs, checks):
+        output = output if not use_json else json.loads(output)
+        assert output == expected
 
 
 def _validate_mmds_snapshot(
@@ -139,10 +184,7 @@ def test_custom_ipv4(uvm_plain, version):
     data_store = {
         "latest": {
             "meta-data": {
-                "ami-id": "ami-12345678",
-                "reservation-id": "r-fea54097",
-                "local-hostname": "ip-10-251-50-12.ec2.internal",
-                "public-hostname": "ec2-203-0-113-25.compute-1.amazonaws.com",
+                **BASE_META_DATA,
                 "network": {
                     "interfaces": {
                         "macs": {
@@ -157,7 +199,6 @@ def test_custom_ipv4(uvm_plain, version):
             }
         }
     }
-    populate_data_store(test_microvm, data_store)
 
     # Attach network device.
     test_microvm.add_net_iface()
@@ -173,16 +214,10 @@ def test_custom_ipv4(uvm_plain, version):
 
     ipv4_address = "169.254.169.250"
     # Configure MMDS with custom IPv4 address.
-    configure_mmds(
-        test_microvm, iface_ids=["eth0"], version=version, ipv4_address=ipv4_address
+    ssh_connection = _configure_and_start(
+        test_microvm, version, data_store, ipv4_address=ipv4_address
     )
 
-    test_microvm.basic_config(vcpu_count=1)
-    test_microvm.start()
-    ssh_connection = test_microvm.ssh
-
-    run_guest_cmd(ssh_connection, f"ip route add {ipv4_address} dev eth0", "")
-
     token = None
     if version == "V2":
         # Generate token.
@@ -193,26 +228,21 @@ def test_custom_ipv4(uvm_plain, version):
         token=token,
     )
 
-    cmd = pre + "latest/meta-data/ami-id"
-    run_guest_cmd(ssh_connection, cmd, "ami-12345678", use_json=True)
-
-    # The request is still valid if we append a
-    # trailing slash to a leaf node.
-    cmd = pre + "latest/meta-data/ami-id/"
-    run_guest_cmd(ssh_connection, cmd, "ami-12345678", use_json=True)
-
-    cmd = (
-        pre + "latest/meta-data/network/interfaces/macs/" "02:29:96:8f:6a:2d/subnet-id"
-    )
-    run_guest_cmd(ssh_connection, cmd, "subnet-be9b61d", use_json=True)
-
-    # Test reading a non-leaf node WITHOUT a trailing slash.
-    cmd = pre + "latest/meta-data"
-    run_guest_cmd(ssh_connection, cmd, data_store["latest"]["meta-data"], use_json=True)
-
-    # Test reading a non-leaf node with a trailing slash.
-    cmd = pre + "latest/meta-data/"
-    run_guest_cmd(ssh_connection, cmd, data_store["latest"]["meta-data"], use_json=True)
+    checks = [
+        ("latest/meta-data/ami-id", "ami-12345678"),
+        # The request is still valid if we append a
+        # trailing slash to a leaf node.
+        ("latest/meta-data/ami-id/", "ami-12345678"),
+        (
+            "latest/meta-data/network/interfaces/macs/02:29:96:8f:6a:2d/subnet-id",
+            "subnet-be9b61d",
+        ),
+        # Test reading a non-leaf node WITHOUT a trailing slash.
+        ("latest/meta-data", data_store["latest"]["meta-data"]),
+        # Test reading a non-leaf node with a trailing slash.
+        ("latest/meta-data/", data_store["latest"]["meta-data"]),
+    ]
+    _run_guest_cmds(ssh_connection, pre, checks, use_json=True)
 
 
 @pytest.mark.parametrize("version", MMDS_VERSIONS)
@@ -226,10 +256,7 @@ def test_json_response(uvm_plain, version):
     data_store = {
         "latest": {
             "meta-data": {
-                "ami-id": "ami-12345678",
-                "reservation-id": "r-fea54097",
-                "local-hostname": "ip-10-251-50-12.ec2.internal",
-                "public-hostname": "ec2-203-0-113-25.compute-1.amazonaws.com",
+                **BASE_META_DATA,
                 "dummy_res": ["res1", "res2"],
             },
             "Limits": {"CPU": 512, "Memory": 512},
@@ -240,18 +267,7 @@ def test_json_response(uvm_plain, version):
     # Attach network device.
     test_microvm.add_net_iface()
 
-    # Configure MMDS version.
-    configure_mmds(test_microvm, iface_ids=["eth0"], version=version)
-
-    # Populate data store with contents.
-    populate_data_store(test_microvm, data_store)
-
-    test_microvm.basic_config(vcpu_count=1)
-    test_microvm.start()
-    ssh_connection = test_microvm.ssh
-
-    cmd = "ip route add {} dev eth0".format(DEFAULT_IPV4)
-    run_guest_cmd(ssh_connection, cmd, "")
+    ssh_connection = _configure_and_start(test_microvm, version, data_store)
 
     token = None
     if version == "V2":
@@ -260,20 +276,14 @@ def test_json_response(uvm_plain, version):
 
     pre = generate_mmds_get_request(DEFAULT_IPV4, token)
 
-    cmd = pre + "latest/meta-data/"
-    run_guest_cmd(ssh_connection, cmd, data_store["latest"]["meta-data"], use_json=True)
-
-    cmd = pre + "latest/meta-data/ami-id/"
-    run_guest_cmd(ssh_connection, cmd, "ami-12345678", use_json=True)
-
-    cmd = pre + "latest/meta-data/dummy_res/0"
-    run_guest_cmd(ssh_connection, cmd, "res1", use_json=True)
-
-    cmd = pre + "latest/Usage/CPU"
-    run_guest_cmd(ssh_connection, cmd, 12.12, use_json=True)
-
-    cmd = pre + "latest/Limits/CPU"
-    run_guest_cmd(ssh_connection, cmd, 512, use_json=True)
+    checks = [
+        ("latest/meta-data/", data_store["latest"]["meta-data"]),
+        ("latest/meta-data/ami-id/", "ami-12345678"),
+        ("latest/meta-data/dummy_res/0", "res1"),
+        ("latest/Usage/CPU", 12.12),
+        ("latest/Limits/CPU", 512),
+    ]
+    _run_guest_cmds(ssh_connection, pre, checks, use_json=True)
 
 
 @pytest.mark.parametrize("version", MMDS_VERSIONS)
@@ -287,10 +297,7 @@ def test_mmds_response(uvm_plain, version):
     data_store = {
         "latest": {
             "meta-data": {
-                "ami-id": "ami-12345678",
-                "reservation-id": "r-fea54097",
-                "local-hostname": "ip-10-251-50-12.ec2.internal",
-                "public-hostname": "ec2-203-0-113-25.compute-1.amazonaws.com",
+                **BASE_META_DATA,
                 "dummy_obj": {
                     "res_key": "res_value",
                 },
@@ -305,17 +312,7 @@ def test_mmds_response(uvm_plain, version):
     # Attach network device.
     test_microvm.add_net_iface()
 
-    # Configure MMDS version.
-    configure_mmds(test_microvm, iface_ids=["eth0"], version=version)
-    # Populate data store with contents.
-    populate_data_store(test_microvm, data_store)
-
-    test_microvm.basic_config(vcpu_count=1)
-    test_microvm.start()
-    ssh_connection = test_microvm.ssh
-
-    cmd = "ip route add {} dev eth0".format(DEFAULT_IPV4)
-    run_guest_cmd(ssh_connection, cmd, "")
+    ssh_connection = _configure_and_start(test_microvm, version, data_store)
 
     token = None
     if version == "V2":
@@ -324,7 +321,6 @@ def test_mmds_response(uvm_plain, version):
 
     pre = generate_mmds_get_request(DEFAULT_IPV4, token=token, app_json=False)
 
-    cmd = pre + "latest/meta-data/"
     expected = (
         "ami-id\n"
         "dummy_array\n"
@@ -334,30 +330,16 @@ def test_mmds_response(uvm_plain, version):
         "public-hostname\n"
         "reservation-id"
     )
-    run_guest_cmd(ssh_connection, cmd, expected)
-
-    cmd = pre + "latest/meta-data/ami-id/"
-    run_guest_cmd(ssh_connection, cmd, "ami-12345678")
-
-    cmd = pre + "latest/meta-data/dummy_array/0"
-    run_guest_cmd(ssh_connection, cmd, "arr_val1")
-
-    cmd = pre + "latest/meta-data/dummy_empty"
-    run_guest_cmd(ssh_connection, cmd, "")
-
-    cmd = pre + "latest/Usage/CPU"
-    run_guest_cmd(
-        ssh_connection,
-        cmd,
-        "Cannot retrieve value. The value has" " an unsupported type.",
-    )
-
-    cmd = pre + "latest/Limits/CPU"
-    run_guest_cmd(
-        ssh_connection,
-        cmd,
-        "Cannot retrieve value. The value has" " an unsupported type.",
-    )
+    unsupported = "Cannot retrieve value. The value has an unsupported type."
+    checks = [
+        ("latest/meta-data/", expected),
+        ("latest/meta-data/ami-id/", "ami-12345678"),
+        ("latest/meta-data/dummy_array/0", "arr_val1"),
+        ("latest/meta-data/dummy_empty", ""),
+        ("latest/Usage/CPU", unsupported),
+        ("latest/Limits/CPU", unsupported),
+    ]
+    _run_guest_cmds(ssh_connection, pre, checks)
 
 
 @pytest.mark.parametrize("version", MMDS_VERSIONS)
@@ -385,8 +367,7 @@ def test_larger_than_mss_payloads(uvm_plain, version):
 
     run_guest_cmd(ssh_connection, "ip link set dev eth0 mtu 1500", "")
 
-    cmd = 'ip a s eth0 | grep -i mtu | tr -s " " | cut -d " " -f 4,5'
-    run_guest_cmd(ssh_connection, cmd, "mtu 1500\n")
+    run_guest_cmd(ssh_connection, "cat /sys/class/net/eth0/mtu", "1500\n")
 
     # These values are usually used by booted up guest network interfaces.
     mtu = 1500
@@ -404,11 +385,10 @@ def test_larger_than_mss_payloads(uvm_plain, version):
         "mss_equal": mss_equal,
         "lower_than_mss": lower_than_mss,
     }
+    # The API client raises if the PUT is rejected, e.g. for its size. The
+    # contents themselves are verified field by field from the guest below.
     test_microvm.api.mmds.put(**data_store)
 
-    response = test_microvm.api.mmds.get()
-    assert response.json() == data_store
-
     run_guest_cmd(ssh_connection, f"ip route add {DEFAULT_IPV4} dev eth0", "")
 
     token = None
@@ -418,14 +398,12 @@ def test_larger_than_mss_payloads(uvm_plain, version):
 
     pre = generate_mmds_get_request(DEFAULT_IPV4, token=token, app_json=False)
 
-    cmd = pre + "larger_than_mss"
-    run_guest_cmd(ssh_connection, cmd, larger_than_mss)
-
-    cmd = pre + "mss_equal"
-    run_guest_cmd(ssh_connection, cmd, mss_equal)
-
-    cmd = pre + "lower_than_mss"
-    run_guest_cmd(ssh_connection, cmd, lower_than_mss)
+    checks = [
+        ("larger_than_mss", larger_than_mss),
+        ("mss_equal", mss_equal),
+        ("lower_than_mss", lower_than_mss),
+    ]
+    _run_guest_cmds(ssh_connection, pre, checks)
 
 
 @pytest.mark.parametrize("version", MMDS_VERSIONS)
@@ -483,17 +461,9 @@ def test_guest_mmds_hang(uvm_plain, version):
 
     # Attach network device.
     test_microvm.add_net_iface()
-    # Configure MMDS version.
-    configure_mmds(test_microvm, iface_ids=["eth0"], version=version)
 
     data_store = {"latest": {"meta-data": {"ami-id": "ami-12345678"}}}
-    populate_data_store(test_microvm, data_store)
-
-    test_microvm.basic_config(vcpu_count=1)
-    test_microvm.start()
-    ssh_connection = test_microvm.ssh
-
-    run_guest_cmd(ssh_connection, f"ip route add {DEFAULT_IPV4} dev eth0", "")
+    ssh_connection = _configure_and_start(test_microvm, version, data_store)
 
     get_cmd = "curl -m 2 -s"
     get_cmd += " -X GET"
@@ -574,7 +544,7 @@ def test_mmds_limit_scenario(uvm_plain, version):
     # Check that the patch actually failed and the contents of the data store
     # has not changed.
     response = test_microvm.api.mmds.get()
-    assert str(response.json()).find(aux) == -1
+    assert aux not in response.text
 
     # Delete something from the mmds so we will be able to send new data.
     dummy_json = {"latest": {"meta-data": {"ami-id": "smth", "secret_key": "a"}}}
@@ -582,7 +552,7 @@ def test_mmds_limit_scenario(uvm_plain, version):
 
     # Check that the size has shrunk.
     response = test_microvm.api.mmds.get()
-    assert len(str(response.json()).replace(" ", "")) == 59
+    assert response.json() == dummy_json
 
     # Try to send a new patch, this time the request should succeed.
     aux = "a" * 100
@@ -591,7 +561,7 @@ def test_mmds_limit_scenario(uvm_plain, version):
 
     # Check that the size grew as expected.
     response = test_microvm.api.mmds.get()
-    assert len(str(response.json()).replace(" ", "")) == 158
+    assert response.json() == dummy_json
 
 
 @pytest.mark.parametrize("version", MMDS_VERSIONS)
@@ -623,26 +593,9 @@ def test_mmds_v2_negative(uvm_plain):
 
     # Attach network device.
     test_microvm.add_net_iface()
-    # Configure MMDS version.
-    configure_mmds(test_microvm, version="V2", iface_ids=["eth0"])
 
-    data_store = {
-        "latest": {
-            "meta-data": {
-                "ami-id": "ami-12345678",
-                "reservation-id": "r-fea54097",
-                "local-hostname": "ip-10-251-50-12.ec2.internal",
-                "public-hostname": "ec2-203-0-113-25.compute-1.amazonaws.com",
-            }
-        }
-    }
-    populate_data_store(test_microvm, data_store)
-
-    test_microvm.basic_config(vcpu_count=1)
-    test_microvm.start()
-    ssh_connection = test_microvm.ssh
-
-    run_guest_cmd(ssh_connection, f"ip route add {DEFAULT_IPV4} dev eth0", "")
+    data_store = {"latest": {"meta-data": BASE_META_DATA}}
+    ssh_connection = _configure_and_start(test_microvm, "V2", data_store)
 
     # Check `GET` request fails when token is not provided.
     cmd = generate_mmds_get_request(DEFAULT_IPV4)
@@ -709,14 +662,19 @@ def test_mmds_v2_negative(uvm_plain):
     token = stdout
     assert len(token) > 0
 
-    # Wait for token to expire.
-    time.sleep(1)
-    # Check `GET` request fails when expired token is provided.
-    run_guest_cmd(
-        ssh_connection,
-        generate_mmds_get_request(DEFAULT_IPV4, token=token),
-        "MMDS token not valid.",
-    )
+    # Check `GET` request fails once the token expired. Poll instead of
+    # sleeping for the whole TTL, so we stop as soon as it is rejected.
+    for attempt in Retrying(
+        wait=wait_fixed(0.1),
+        stop=stop_after_delay(MIN_TOKEN_TTL_SECONDS + 2),
+        reraise=True,
+    ):
+        with attempt:
+            run_guest_cmd(
+                ssh_connection,
+                generate_mmds_get_request(DEFAULT_IPV4, token=token),
+                "MMDS token not valid.",
+            )
 
 
 def test_deprecated_mmds_config(uvm_plain):
@@ -3,9 +3,9 @@
 """Tests for the net device."""
 
 import re
-import time
 
 import pytest
+from tenacity import Retrying, stop_after_delay, wait_fixed
 
 from framework import utils
 
@@ -15,6 +15,8 @@ IPERF_BINARY_GUEST = "iperf3"
 # because iperf3 3.16+ crashes on aarch64 sometimes
 # when running this test.
 IPERF_BINARY_HOST = "iperf3-vsock"
+# The default port iperf3 servers listen on
+IPERF_PORT = 5201
 
 
 def test_high_ingress_traffic(uvm_plain_any):
@@ -38,12 +40,23 @@ def test_high_ingress_traffic(uvm_plain_any):
 
     # Start iperf3 server on the guest.
     test_microvm.ssh.check_output("{} -sD\n".format(IPERF_BINARY_GUEST))
-    time.sleep(1)
+
+    # Wait for the daemonized server to listen, instead of a fixed sleep.
+    for attempt in Retrying(
+        wait=wait_fixed(0.1), stop=stop_after_delay(5), reraise=True
+    ):
+        with attempt:
+            _, stdout, _ = test_microvm.ssh.check_output(
+                f"ss -ltnH sport = :{IPERF_PORT}"
+            )
+            assert stdout.strip()
 
     # Start iperf3 client on the host. Send 1Gbps UDP traffic.
-    # If the net device breaks, iperf will freeze, and we'll hit the pytest timeout
+    # If the net device breaks, iperf will freeze, and we'll hit the pytest timeout.
+    # With a tx queue length of 5 the tap fills up within the first bursts, so
+    # a few seconds of traffic are enough to trigger it.
     utils.check_output(
-        "{} {} -c {} -u -V -b 1000000000 -t 30".format(
+        "{} {} -c {} -u -V -b 1000000000 -t 5".format(
             test_microvm.netns.cmd_prefix(),
             IPERF_BINARY_HOST,
             guest_ip,
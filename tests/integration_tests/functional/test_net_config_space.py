@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 """Tests on devices config space."""
 
-import platform
 import random
 import re
 import string
@@ -10,6 +9,7 @@ import subprocess
 from threading import Thread
 
 import host_tools.network as net_tools  # pylint: disable=import-error
+from framework.properties import global_props
 
 # pylint: disable=global-statement
 PAYLOAD_DATA_SIZE = 20
@@ -289,14 +289,14 @@ def _get_net_mem_addr_base_x86_cmdline(ssh_connection, if_name):
 
 def _get_net_mem_addr_base(ssh_connection, if_name):
     """Get the net device memory start address."""
-    if platform.machine() == "x86_64":
+    if global_props.cpu_architecture == "x86_64":
         acpi_info = _get_net_mem_addr_base_x86_acpi(ssh_connection, if_name)
         if acpi_info is not None:
             return acpi_info
 
         return _get_net_mem_addr_base_x86_cmdline(ssh_connection, if_name)
 
-    if platform.machine() == "aarch64":
+    if global_props.cpu_architecture == "aarch64":
         sys_virtio_mmio_cmdline = "/sys/devices/platform"
         cmd = "ls {} | grep .virtio_mmio".format(sys_virtio_mmio_cmdline)
         rc, stdout, _ = ssh_connection.run(cmd)
@@ -2,11 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 """Tests scenarios for shutting down Firecracker/VM."""
 
-import platform
-
+import psutil
 from packaging import version
 
-from framework import utils
+from framework.properties import global_props
 
 
 def test_reboot(uvm_plain_any):
@@ -31,10 +30,7 @@ def test_reboot(uvm_plain_any):
     firecracker_pid = vm.firecracker_pid
 
     # Get number of threads in Firecracker
-    cmd = "ps -o nlwp {} | tail -1 | awk '{{print $1}}'".format(firecracker_pid)
-    _, stdout, _ = utils.check_output(cmd)
-    nr_of_threads = stdout.rstrip()
-    assert int(nr_of_threads) == 6
+    assert psutil.Process(firecracker_pid).num_threads() == 6
 
     # Consume existing metrics
     lines = vm.get_all_metrics()
@@ -49,10 +45,10 @@ def test_reboot(uvm_plain_any):
     datapoints = vm.get_all_metrics()
     assert len(datapoints) == 2
 
-    if platform.machine() != "x86_64":
+    if global_props.cpu_architecture != "x86_64":
         message = (
             "Received KVM_SYSTEM_EVENT: type: 2, event: [0]"
-            if version.parse(utils.get_kernel_version()) >= version.parse("5.18")
+            if version.parse(global_props.host_linux_patch) >= version.parse("5.18")
             else "Received KVM_SYSTEM_EVENT: type: 2, event: []"
         )
         vm.check_log_message(message)
@@ -41,13 +41,12 @@ def check_vmgenid_update_count(vm, resume_count):
 
 
 def _get_guest_drive_size(ssh_connection, guest_dev_name="/dev/vdb"):
-    # `lsblk` command outputs 2 lines to STDOUT:
-    # "SIZE" and the size of the device, in bytes.
-    blksize_cmd = "LSBLK_DEBUG=all lsblk -b {} --output SIZE".format(guest_dev_name)
+    # `lsblk -n` skips the "SIZE" header, so the output is just the size of
+    # the device, in bytes.
+    blksize_cmd = "LSBLK_DEBUG=all lsblk -bn {} --output SIZE".format(guest_dev_name)
     rc, stdout, stderr = ssh_connection.run(blksize_cmd)
     assert rc == 0, stderr
-    lines = stdout.split("\n")
-    return lines[1].strip()
+    return stdout.strip()
 
 
 @pytest.mark.parametrize("resume_at_restore", [True, False])
@@ -145,6 +144,9 @@ def test_5_snapshots(
     snapshot = vm.make_snapshot(snapshot_type)
     vm.kill()
 
+    # Socket paths relative to each restored microVM's directory.
+    host_port_path = make_host_port_path(VSOCK_UDS_PATH, ECHO_SERVER_PORT)
+
     for i in range(seq_len):
         logger.info("Load snapshot #%s, mem %s", i, snapshot.mem)
         microvm = microvm_factory.build()
@@ -155,9 +157,7 @@ def test_5_snapshots(
         # related spurious test failures, although we do not know why this is the case.
         time.sleep(2)
         # Test vsock guest-initiated connections.
-        path = os.path.join(
-            microvm.path, make_host_port_path(VSOCK_UDS_PATH, ECHO_SERVER_PORT)
-        )
+        path = os.path.join(microvm.path, host_port_path)
         check_guest_connections(microvm, path, vm_blob_path, blob_hash)
         # Test vsock host-initiated connections.
         path = os.path.join(microvm.jailer.chroot_path(), VSOCK_UDS_PATH)
@@ -5,12 +5,12 @@
 
 import json
 import logging
-import platform
 from pathlib import Path
 
 import pytest
 
 from framework.defs import FC_WORKSPACE_DIR
+from framework.properties import global_props
 from framework.utils import (
     generate_mmds_get_request,
     generate_mmds_session_token,
@@ -75,7 +75,7 @@ def get_snapshot_dirs():
     snapshot_root_name = "snapshot_artifacts"
     snapshot_root_dir = Path(FC_WORKSPACE_DIR) / snapshot_root_name
     cpu_templates = []
-    if platform.machine() == "x86_64":
+    if global_props.cpu_architecture == "x86_64":
         cpu_templates = ["None"]
     cpu_templates += get_supported_cpu_templates()
     for cpu_template in cpu_templates:
@@ -65,18 +65,15 @@ def _check_cache_topology_x86(
             key_share: expected_lvl_3_str,
         }
 
-    utils.check_guest_cpuid_output(
-        vm, "cpuid -1", "--- cache 0 ---", "=", expected_level_1_topology
-    )
-    utils.check_guest_cpuid_output(
-        vm, "cpuid -1", "--- cache 1 ---", "=", expected_level_1_topology
-    )
-    utils.check_guest_cpuid_output(
-        vm, "cpuid -1", "--- cache 2 ---", "=", expected_level_1_topology
-    )
-    utils.check_guest_cpuid_output(
-        vm, "cpuid -1", "--- cache 3 ---", "=", expected_level_3_topology
-    )
+    # All cache descriptors are part of the same `cpuid` dump, so only fetch it
+    # once from the guest.
+    _, stdout, stderr = vm.ssh.run("cpuid -1")
+    assert stderr == ""
+
+    utils.check_cpuid_output(stdout, "--- cache 0 ---", "=", expected_level_1_topology)
+    utils.check_cpuid_output(stdout, "--- cache 1 ---", "=", expected_level_1_topology)
+    utils.check_cpuid_output(stdout, "--- cache 2 ---", "=", expected_level_1_topology)
+    utils.check_cpuid_output(stdout, "--- cache 3 ---", "=", expected_level_3_topology)
 
 
 def _aarch64_parse_cache_info(test_microvm, no_cpus):
@@ -148,31 +145,13 @@ def _check_cache_topology_arm(test_microvm, no_cpus, kernel_version_tpl):
         assert guest_slice == host_slice
 
 
-@pytest.mark.skipif(
-    PLATFORM != "x86_64", reason="Firecracker supports CPU topology only on x86_64."
-)
 @pytest.mark.parametrize("num_vcpus", [1, 2, 16])
 @pytest.mark.parametrize("htt", [True, False])
-def test_cpu_topology(uvm_plain_any, num_vcpus, htt):
+def test_topology(uvm_plain_any, num_vcpus, htt):
     """
-    Check the CPU topology for a microvm with the specified config.
-    """
-    vm = uvm_plain_any
-    vm.spawn()
-    vm.basic_config(vcpu_count=num_vcpus, smt=htt)
-    vm.add_net_iface()
-    vm.start()
-
-    _check_cpu_topology(
-        vm, num_vcpus, 2 if htt and num_vcpus > 1 else 1, TOPOLOGY_STR[num_vcpus]
-    )
-
+    Check the CPU and cache topology for a microvm with the specified config.
 
-@pytest.mark.parametrize("num_vcpus", [1, 2, 16])
-@pytest.mark.parametrize("htt", [True, False])
-def test_cache_topology(uvm_plain_any, num_vcpus, htt):
-    """
-    Check the cache topology for a microvm with the specified config.
+    Both checks only read from the guest, so they share a single boot.
     """
     if htt and PLATFORM == "aarch64":
         pytest.skip("SMT is configurable only on x86.")
@@ -182,6 +161,10 @@ def test_cache_topology(uvm_plain_any, num_vcpus, htt):
     vm.add_net_iface()
     vm.start()
     if PLATFORM == "x86_64":
+        # Firecracker supports CPU topology only on x86_64.
+        _check_cpu_topology(
+            vm, num_vcpus, 2 if htt and num_vcpus > 1 else 1, TOPOLOGY_STR[num_vcpus]
+        )
         _check_cache_topology_x86(vm, 1 if htt and num_vcpus > 1 else 0, num_vcpus - 1)
     elif PLATFORM == "aarch64":
         _check_cache_topology_arm(vm, num_vcpus, global_props.host_linux_version_tpl)
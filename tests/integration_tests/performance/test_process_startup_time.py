@@ -2,9 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 """Test that the process startup time up to socket bind is within spec."""
 
-import os
 import time
 
+from tenacity import Retrying, stop_after_delay, wait_fixed
+
 from host_tools.cargo_build import run_seccompiler_bin
 
 
@@ -32,32 +33,43 @@ def test_startup_time_daemonize(
 
 
 def test_startup_time_custom_seccomp(
-    microvm_factory, guest_kernel_linux_5_10, rootfs, metrics
+    microvm_factory, guest_kernel_linux_5_10, rootfs, metrics, tmp_path
 ):
     """
     Check the startup time when using custom seccomp filters.
     """
+    # The compiled filter is the same for every iteration, so only run
+    # seccompiler once.
+    bpf_path = tmp_path / "bpf.out"
+    run_seccompiler_bin(bpf_path)
+
     for _ in range(10):
         microvm = microvm_factory.build(guest_kernel_linux_5_10, rootfs)
-        _custom_filter_setup(microvm)
+        _custom_filter_setup(microvm, bpf_path)
         _test_startup_time(microvm, metrics, "custom_seccomp")
 
 
 def _test_startup_time(microvm, metrics, test_suffix: str):
+    # Firecracker reports its startup time when the API socket is bound, which
+    # happens during spawn(), so the measured window has to include it.
+    test_start_time = time.perf_counter_ns()
     microvm.spawn()
     microvm.basic_config(vcpu_count=2, mem_size_mib=1024)
     metrics.set_dimensions(
         {**microvm.dimensions, "performance_test": f"test_startup_time_{test_suffix}"}
     )
-    test_start_time = time.time()
     microvm.start()
-    time.sleep(0.4)
 
     # The metrics should be at index 1.
     # Since metrics are flushed at InstanceStart, the first line will suffice.
-    datapoints = microvm.get_all_metrics()
-    test_end_time = time.time()
-    fc_metrics = datapoints[0]
+    # Poll for it rather than sleeping for a fixed amount of time.
+    for attempt in Retrying(
+        wait=wait_fixed(0.05), stop=stop_after_delay(5), reraise=True
+    ):
+        with attempt:
+            fc_metrics = next(microvm.get_metrics(), None)
+            assert fc_metrics is not None, "No metrics were written by Firecracker"
+    test_end_time = time.perf_counter_ns()
     startup_time_us = fc_metrics["api_server"]["process_startup_time_us"]
     cpu_startup_time_us = fc_metrics["api_server"]["process_startup_time_cpu_us"]
 
@@ -71,17 +83,13 @@ def _test_startup_time(microvm, metrics, test_suffix: str):
     # Check that startup time is not a huge value
     # This is to catch issues like the ones introduced in PR
     # https://github.com/firecracker-microvm/firecracker/pull/4305
-    test_time_delta_us = (test_end_time - test_start_time) * 1000 * 1000
+    test_time_delta_us = (test_end_time - test_start_time) // 1000
     assert startup_time_us < test_time_delta_us
     assert cpu_startup_time_us < test_time_delta_us
 
     metrics.put_metric("startup_time", cpu_startup_time_us, unit="Microseconds")
 
 
-def _custom_filter_setup(test_microvm):
-    bpf_path = os.path.join(test_microvm.path, "bpf.out")
-
-    run_seccompiler_bin(bpf_path)
-
+def _custom_filter_setup(test_microvm, bpf_path):
     test_microvm.create_jailed_resource(bpf_path)
     test_microvm.jailer.extra_args.update({"seccomp-filter": "bpf.out"})
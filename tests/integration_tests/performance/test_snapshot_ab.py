@@ -1,9 +1,8 @@
 # Copyright 2023 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 """Performance benchmark for snapshot restore."""
-import tempfile
+
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import List
 
 import pytest
@@ -15,12 +14,13 @@ USEC_IN_MSEC = 1000
 ITERATIONS = 30
 
 
-@lru_cache
-def get_scratch_drives():
-    """Create an array of scratch disks."""
+@pytest.fixture(scope="session")
+def scratch_drives(tmp_path_factory):
+    """Create an array of scratch disks, shared by all tests of the session."""
+    tmp_dir = tmp_path_factory.mktemp("scratch_drives")
     scratchdisks = ["vdb", "vdc", "vdd", "vde"]
     return [
-        (drive, drive_tools.FilesystemFile(tempfile.mktemp(), size=64))
+        (drive, drive_tools.FilesystemFile(str(tmp_dir / drive), size=64))
         for drive in scratchdisks
     ]
 
@@ -45,6 +45,7 @@ class SnapshotRestoreTest:
         microvm_factory,
         guest_kernel_acpi,
         rootfs,
+        scratch_drives,
     ) -> Microvm:
         """Creates the initial snapshot that will be loaded repeatedly to sample latencies"""
         vm = microvm_factory.build(
@@ -64,7 +65,6 @@ class SnapshotRestoreTest:
             vm.add_net_iface()
 
         if self.blocks > 1:
-            scratch_drives = get_scratch_drives()
             for name, diskfile in scratch_drives[: (self.blocks - 1)]:
                 vm.add_drive(name, diskfile.path, io_engine="Sync")
 
@@ -125,7 +125,12 @@ class SnapshotRestoreTest:
     ids=lambda x: x.id,
 )
 def test_restore_latency(
-    microvm_factory, rootfs, guest_kernel_linux_5_10, test_setup, metrics
+    microvm_factory,
+    rootfs,
+    guest_kernel_linux_5_10,
+    test_setup,
+    metrics,
+    scratch_drives,
 ):
     """
     Restores snapshots with vcpu/memory configuration, roughly scaling according to mem = (vcpus - 1) * 2048MB,
@@ -134,7 +139,9 @@ def test_restore_latency(
 
     We only test a single guest kernel, as the guest kernel does not "participate" in snapshot restore.
     """
-    vm = test_setup.configure_vm(microvm_factory, guest_kernel_linux_5_10, rootfs)
+    vm = test_setup.configure_vm(
+        microvm_factory, guest_kernel_linux_5_10, rootfs, scratch_drives
+    )
     vm.start()
 
     metrics.set_dimensions(
@@ -21,8 +21,9 @@ class VsockIPerf3Test(IPerf3Test):
     # Time (in seconds) for which iperf "warms up"
     WARMUP_SEC = 3
 
-    # Time (in seconds) for which iperf runs after warmup is done
-    RUNTIME_SEC = 20
+    # Time (in seconds) for which iperf runs after warmup is done. Can be
+    # lowered through the environment for quicker, noisier runs.
+    RUNTIME_SEC = int(os.environ.get("VSOCK_IPERF_TIME", 20))
 
     # VM guest memory size
     GUEST_MEM_MIB = 1024
@@ -70,7 +71,7 @@ class VsockIPerf3Test(IPerf3Test):
 @pytest.mark.timeout(120)
 @pytest.mark.nonci
 @pytest.mark.parametrize("vcpus", [1, 2], ids=["1vcpu", "2vcpu"])
-@pytest.mark.parametrize("payload_length", ["64K", "1024K"], ids=["p64K", "p1024K"])
+@pytest.mark.parametrize("payload_length", ["64K"], ids=["p64K"])
 @pytest.mark.parametrize("mode", ["g2h", "h2g", "bd"])
 def test_vsock_throughput(
     microvm_factory, guest_kernel_acpi, rootfs, vcpus, payload_length, mode, metrics
@@ -7,6 +7,7 @@ import time
 from pathlib import Path
 
 import requests
+from tenacity import Retrying, stop_after_delay, wait_fixed
 
 from framework import utils
 
@@ -124,8 +125,13 @@ def test_invalid_bpf(uvm_plain):
     test_microvm.jailer.extra_args.update({"seccomp-filter": bpf_path.name})
 
     test_microvm.spawn()
-    # give time for the process to get killed
-    time.sleep(1)
-    assert "Seccomp error: Filter deserialization failed" in test_microvm.log_data
+    # Wait for the process to log the error and get killed.
+    for attempt in Retrying(
+        wait=wait_fixed(0.1), stop=stop_after_delay(5), reraise=True
+    ):
+        with attempt:
+            assert (
+                "Seccomp error: Filter deserialization failed" in test_microvm.log_data
+            )
 
     test_microvm.mark_killed()
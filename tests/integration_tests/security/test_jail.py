@@ -6,10 +6,11 @@ import http.client as http_client
 import os
 import resource
 import stat
-import subprocess
 import time
+from functools import lru_cache
 from pathlib import Path
 
+import psutil
 import pytest
 import requests
 import urllib3
@@ -41,6 +42,8 @@ RESOURCE_LIMITS = [
     "no-file={}".format(NOFILE),
     "fsize={}".format(FSIZE),
 ]
+# We assume sysfs cgroups are mounted here.
+CGROUP_ROOT = Path("/sys/fs/cgroup")
 
 
 def check_stats(filepath, stats, uid, gid):
@@ -131,45 +134,19 @@ def test_default_chroot_hierarchy(uvm_plain):
 
     # We do checks for all the things inside the chroot that the jailer crates
     # by default.
-    check_stats(
-        test_microvm.jailer.chroot_path(),
-        DIR_STATS,
-        test_microvm.jailer.uid,
-        test_microvm.jailer.gid,
-    )
-    check_stats(
-        os.path.join(test_microvm.jailer.chroot_path(), "dev"),
-        DIR_STATS,
-        test_microvm.jailer.uid,
-        test_microvm.jailer.gid,
-    )
-    check_stats(
-        os.path.join(test_microvm.jailer.chroot_path(), "dev/net"),
-        DIR_STATS,
-        test_microvm.jailer.uid,
-        test_microvm.jailer.gid,
-    )
-    check_stats(
-        os.path.join(test_microvm.jailer.chroot_path(), "run"),
-        DIR_STATS,
-        test_microvm.jailer.uid,
-        test_microvm.jailer.gid,
-    )
-    check_stats(
-        os.path.join(test_microvm.jailer.chroot_path(), "dev/net/tun"),
-        CHAR_STATS,
-        test_microvm.jailer.uid,
-        test_microvm.jailer.gid,
-    )
-    check_stats(
-        os.path.join(test_microvm.jailer.chroot_path(), "dev/kvm"),
-        CHAR_STATS,
-        test_microvm.jailer.uid,
-        test_microvm.jailer.gid,
-    )
-    check_stats(
-        os.path.join(test_microvm.jailer.chroot_path(), "firecracker"), FILE_STATS, 0, 0
-    )
+    chroot = test_microvm.jailer.chroot_path()
+    uid, gid = test_microvm.jailer.uid, test_microvm.jailer.gid
+    expected = [
+        ("", DIR_STATS, uid, gid),
+        ("dev", DIR_STATS, uid, gid),
+        ("dev/net", DIR_STATS, uid, gid),
+        ("run", DIR_STATS, uid, gid),
+        ("dev/net/tun", CHAR_STATS, uid, gid),
+        ("dev/kvm", CHAR_STATS, uid, gid),
+        ("firecracker", FILE_STATS, 0, 0),
+    ]
+    for path, stats, path_uid, path_gid in expected:
+        check_stats(os.path.join(chroot, path), stats, path_uid, path_gid)
 
 
 def test_arbitrary_usocket_location(uvm_plain):
@@ -193,7 +170,8 @@ class Cgroups:
     """Helper class to work with cgroups"""
 
     def __init__(self):
-        self.root = Path("/sys/fs/cgroup")
+        self.root = CGROUP_ROOT
+        assert self.root.is_dir()
         self.version = 2
         # https://rootlesscontaine.rs/getting-started/common/cgroup2/#checking-whether-cgroup-v2-is-already-enabled
         if not self.root.joinpath("cgroup.controllers").exists():
@@ -217,31 +195,27 @@ def cgroups_info():
 
 def check_cgroups_v1(cgroups, jailer_id, parent_cgroup=FC_BINARY_NAME):
     """Assert that every cgroupv1 in cgroups is correctly set."""
-    # We assume sysfs cgroups are mounted here.
-    cgroup_location = "/sys/fs/cgroup"
-    assert os.path.isdir(cgroup_location)
-
     for cgroup in cgroups:
         controller = cgroup.split(".")[0]
         file_name, value = cgroup.split("=")
-        location = cgroup_location + "/{}/{}/{}/".format(
-            controller, parent_cgroup, jailer_id
-        )
-        tasks_file = location + "tasks"
-        file = location + file_name
+        location = CGROUP_ROOT / controller / parent_cgroup / jailer_id
+
+        assert _read_first_line(location / file_name) == value
+        assert _read_first_line(location / "tasks").isdigit()
+
 
-        assert open(file, "r", encoding="utf-8").readline().strip() == value
-        assert open(tasks_file, "r", encoding="utf-8").readline().strip().isdigit()
+def _read_first_line(path):
+    """Read the first line of a (small) sysfs/cgroup file and close it."""
+    with open(path, "r", encoding="utf-8") as file:
+        return file.readline().strip()
 
 
 def check_cgroups_v2(vm):
     """Assert that every cgroupv2 in cgroups is correctly set."""
-    cg = Cgroups()
-    assert cg.root.is_dir()
     parent_cgroup = vm.jailer.parent_cgroup
     if parent_cgroup is None:
         parent_cgroup = FC_BINARY_NAME
-    cg_parent = cg.root / parent_cgroup
+    cg_parent = CGROUP_ROOT / parent_cgroup
     cg_jail = cg_parent / vm.jailer.jailer_id
 
     # if no cgroups were specified, then the jailer should move the FC process
@@ -261,7 +235,7 @@ def check_cgroups_v2(vm):
         assert all(x.isnumeric() for x in procs)
         assert str(vm.firecracker_pid) in procs
 
-        for cgroup in [cg.root, cg_parent, cg_jail]:
+        for cgroup in [CGROUP_ROOT, cg_parent, cg_jail]:
             assert controller in cgroup.joinpath("cgroup.controllers").read_text(
                 encoding="ascii"
             )
@@ -273,13 +247,15 @@ def check_cgroups_v2(vm):
             )
 
 
+# The host topology does not change during a test session.
+@lru_cache
 def get_cpus(node):
     """Retrieve CPUs from NUMA node."""
     sys_node = "/sys/devices/system/node/node" + str(node)
     assert os.path.isdir(sys_node)
     node_cpus_path = sys_node + "/cpulist"
 
-    return open(node_cpus_path, "r", encoding="utf-8").readline().strip()
+    return _read_first_line(node_cpus_path)
 
 
 def check_limits(pid, no_file, fsize):
@@ -436,17 +412,9 @@ def test_args_default_resource_limits(uvm_plain):
     pid = test_microvm.firecracker_pid
     assert pid != 0
 
-    # Fetch firecracker process limits for number of open fds
-    (soft, hard) = resource.prlimit(pid, resource.RLIMIT_NOFILE)
-    # Check that the default limit was set.
-    assert soft == 2048
-    assert hard == 2048
-
-    # Fetch firecracker process limits for number of open fds
-    (soft, hard) = resource.prlimit(pid, resource.RLIMIT_FSIZE)
-    # Check that no limit was set
-    assert soft == -1
-    assert hard == -1
+    # Check that the default number of open fds limit was set and that no
+    # file size limit was set.
+    check_limits(pid, 2048, resource.RLIM_INFINITY)
 
 
 def test_args_resource_limits(uvm_plain):
@@ -559,18 +527,20 @@ def test_new_pid_namespace(uvm_plain):
     fc_pid = test_microvm.firecracker_pid
 
     # Validate the PID.
-    stdout = subprocess.check_output("pidof firecracker", shell=True)
-    assert str(fc_pid) in stdout.strip().decode()
+    fc_pids = [
+        proc.pid
+        for proc in psutil.process_iter(["name"])
+        if proc.info["name"] == "firecracker"
+    ]
+    assert fc_pid in fc_pids
 
     # Get the thread group IDs in each of the PID namespaces of which
     # Firecracker process is a member of.
-    nstgid_cmd = "cat /proc/{}/status | grep NStgid".format(fc_pid)
-    nstgid_list = (
-        subprocess.check_output(nstgid_cmd, shell=True)
-        .decode("utf-8")
-        .strip()
-        .split("\t")[1:]
+    status = dict(
+        line.split(":", 1)
+        for line in Path(f"/proc/{fc_pid}/status").read_text("utf-8").splitlines()
     )
+    nstgid_list = status["NStgid"].split()
 
     # Check that Firecracker's PID namespace is nested. `NStgid` should
     # report two values and the last one should be 1, because Firecracker
@@ -12,34 +12,31 @@ from framework import utils
 ARCH = platform.machine()
 
 
-def _get_basic_syscall_list():
-    """Return the JSON list of syscalls that the demo jailer needs."""
-    sys_list = [
-        "rt_sigprocmask",
-        "rt_sigaction",
-        "execve",
-        "mmap",
-        "mprotect",
-        "set_tid_address",
-        "read",
-        "close",
-        "brk",
-        "sched_getaffinity",
-        "sigaltstack",
-        "munmap",
-        "exit_group",
+# The syscalls that the demo jailer needs.
+BASIC_SYSCALLS = [
+    "rt_sigprocmask",
+    "rt_sigaction",
+    "execve",
+    "mmap",
+    "mprotect",
+    "set_tid_address",
+    "read",
+    "close",
+    "brk",
+    "sched_getaffinity",
+    "sigaltstack",
+    "munmap",
+    "exit_group",
+]
+if ARCH == "x86_64":
+    BASIC_SYSCALLS += [
+        "arch_prctl",
+        "readlink",
+        "open",
+        "poll",
     ]
-    if ARCH == "x86_64":
-        sys_list += [
-            "arch_prctl",
-            "readlink",
-            "open",
-            "poll",
-        ]
-    elif ARCH == "aarch64":
-        sys_list += ["ppoll"]
-
-    return sys_list
+elif ARCH == "aarch64":
+    BASIC_SYSCALLS += ["ppoll"]
 
 
 def test_seccomp_ls(bin_seccomp_paths, seccompiler):
@@ -59,7 +56,7 @@ def test_seccomp_ls(bin_seccomp_paths, seccompiler):
         "main": {
             "default_action": "trap",
             "filter_action": "allow",
-            "filter": [{"syscall": x} for x in _get_basic_syscall_list()],
+            "filter": [{"syscall": x} for x in BASIC_SYSCALLS],
         }
     }
 
@@ -98,7 +95,7 @@ def test_advanced_seccomp(bin_seccomp_paths, seccompiler):
             "default_action": "trap",
             "filter_action": "allow",
             "filter": [
-                *[{"syscall": x} for x in _get_basic_syscall_list()],
+                *[{"syscall": x} for x in BASIC_SYSCALLS],
                 {
                     "syscall": "write",
                     "args": [
@@ -7,6 +7,9 @@
 """Tests vulnerabilities mitigations."""
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
@@ -16,6 +19,7 @@ from framework import utils
 from framework.ab_test import git_clone
 from framework.microvm import MicroVMFactory
 from framework.properties import global_props
+from framework.with_filelock import with_filelock
 
 CHECKER_URL = "https://meltdown.ovh"
 CHECKER_FILENAME = "spectre-meltdown-checker.sh"
@@ -92,13 +96,32 @@ class SpectreMeltdownChecker:
         return set()
 
 
+@with_filelock
+def _download_spectre_meltdown_checker(path):
+    """Download the checker script to `path`, unless another worker already did."""
+    if path.exists():
+        return
+    # Stream into a temporary file and rename it once complete, so that other
+    # workers never pick up a partial download.
+    part_path = path.with_suffix(".part")
+    with requests.get(CHECKER_URL, stream=True, timeout=5) as resp:
+        resp.raise_for_status()
+        with part_path.open("wb") as file:
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                file.write(chunk)
+    part_path.rename(path)
+
+
 @pytest.fixture(scope="session", name="spectre_meltdown_checker")
 def download_spectre_meltdown_checker(tmp_path_factory):
     """Download spectre / meltdown checker script."""
-    resp = requests.get(CHECKER_URL, timeout=5)
-    resp.raise_for_status()
-    path = tmp_path_factory.mktemp("tmp", True) / CHECKER_FILENAME
-    path.write_bytes(resp.content)
+    tmp_dir = tmp_path_factory.getbasetemp()
+    # When running under xdist, the parent of the base temporary directory is
+    # shared by all workers of this session, so only download the script once.
+    if os.environ.get("PYTEST_XDIST_WORKER") is not None:
+        tmp_dir = tmp_dir.parent
+    path = tmp_dir / CHECKER_FILENAME
+    _download_spectre_meltdown_checker(path)
     return SpectreMeltdownChecker(path)
 
 
@@ -125,6 +148,7 @@ def test_vulnerabilities_on_host():
     assert res.returncode == 1, res.stdout
 
 
+@lru_cache
 def get_vuln_files_exception_dict(template):
     """
     Returns a dictionary of expected values for vulnerability files requiring special treatment.
@@ -177,10 +201,9 @@ def check_vulnerabilities_files_on_guest(microvm):
     See also: https://elixir.bootlin.com/linux/latest/source/Documentation/ABI/testing/sysfs-devices-system-cpu
     and search for `vulnerabilities`.
     """
-    # Retrieve a list of vulnerabilities files available inside guests.
-    vuln_dir = "/sys/devices/system/cpu/vulnerabilities"
-    _, stdout, _ = microvm.ssh.check_output(f"find -D all {vuln_dir} -type f")
-    vuln_files = stdout.splitlines()
+    # Retrieve the contents of all vulnerabilities files available inside guests
+    # in a single round trip, as "<path>:<content>" lines.
+    _, stdout, _ = microvm.ssh.check_output(f"grep -r '' {VULN_DIR}")
 
     # Fixtures in this file (test_vulnerabilities.py) add this special field.
     template = microvm.cpu_template_name
@@ -189,15 +212,14 @@ def check_vulnerabilities_files_on_guest(microvm):
     # the others do not contain "Vulnerable".
     exceptions = get_vuln_files_exception_dict(template)
     results = []
-    for vuln_file in vuln_files:
+    for line in stdout.splitlines():
+        vuln_file, _, content = line.partition(":")
         filename = Path(vuln_file).name
         if filename in exceptions:
-            _, stdout, _ = microvm.ssh.check_output(f"cat {vuln_file}")
-            assert exceptions[filename] in stdout
+            assert exceptions[filename] in content
         else:
-            cmd = f"grep Vulnerable {vuln_file}"
-            _ecode, stdout, _stderr = microvm.ssh.run(cmd)
-            results.append({"file": vuln_file, "stdout": stdout})
+            vulnerable = content if "Vulnerable" in content else ""
+            results.append({"file": vuln_file, "stdout": vulnerable})
     return results
 
 
@@ -224,15 +246,27 @@ def uvm_any_a(microvm_factory_a, uvm_ctor, guest_kernel, rootfs, cpu_template_an
     return uvm_ctor(microvm_factory_a, guest_kernel, rootfs, cpu_template_any)
 
 
+def check_ab(request, uvm_b, check):
+    """Run `check` on `uvm_b` and on the matching revision A microVM.
+
+    The two runs are independent, so the B microVM is checked in the
+    background while the A microVM boots.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future_b = executor.submit(check, uvm_b)
+        # we only get the uvm_any_a fixtures if we need it
+        uvm_a = request.getfixturevalue("uvm_any_a")
+        res_a = check(uvm_a)
+        return future_b.result(), res_a
+
+
 def test_check_vulnerability_files_ab(request, uvm_any):
     """Test vulnerability files on guests"""
-    res_b = check_vulnerabilities_files_on_guest(uvm_any)
     if global_props.buildkite_pr:
-        # we only get the uvm_any_a fixtures if we need it
-        uvm_a = request.getfixturevalue("uvm_any_a")
-        res_a = check_vulnerabilities_files_on_guest(uvm_a)
+        res_b, res_a = check_ab(request, uvm_any, check_vulnerabilities_files_on_guest)
         assert res_b <= res_a
     else:
+        res_b = check_vulnerabilities_files_on_guest(uvm_any)
         assert not [x for x in res_b if "Vulnerable" in x["stdout"]]
 
 
@@ -242,13 +276,13 @@ def test_spectre_meltdown_checker_on_guest(
     spectre_meltdown_checker,
 ):
     """Test with the spectre / meltdown checker on any supported guest."""
-    res_b = spectre_meltdown_checker.get_report_for_guest(uvm_any)
     if global_props.buildkite_pr:
-        # we only get the uvm_any_a fixtures if we need it
-        uvm_a = request.getfixturevalue("uvm_any_a")
-        res_a = spectre_meltdown_checker.get_report_for_guest(uvm_a)
+        res_b, res_a = check_ab(
+            request, uvm_any, spectre_meltdown_checker.get_report_for_guest
+        )
         assert res_b <= res_a
     else:
+        res_b = spectre_meltdown_checker.get_report_for_guest(uvm_any)
         assert res_b == spectre_meltdown_checker.expected_vulnerabilities(
             uvm_any.cpu_template_name
         )
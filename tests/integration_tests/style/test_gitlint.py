@@ -2,17 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 """Tests ensuring desired style for commit messages."""
 
-import os
-
 from framework import utils
 
 
-def test_gitlint():
+def test_gitlint(monkeypatch):
     """
     Test that all commit messages pass the gitlint rules.
     """
-    os.environ["LC_ALL"] = "C.UTF-8"
-    os.environ["LANG"] = "C.UTF-8"
+    monkeypatch.setenv("LC_ALL", "C.UTF-8")
+    monkeypatch.setenv("LANG", "C.UTF-8")
 
     rc, _, stderr = utils.run_cmd(
         "gitlint --commits origin/main..HEAD -C ../.gitlint --extra-path framework/gitlint_rules.py",